@@ -1,11 +1,12 @@
 import asyncio
 from playwright.async_api import async_playwright
+from scraper import CHROMIUM_ARGS
 
 CLUB_URL = "https://ratingviewer.nl/lists/latest/clubs/020027"
 
 async def debug_scrape():
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
         page = await browser.new_page()
         await page.goto(CLUB_URL)
         await page.wait_for_selector(".rdt_TableRow")
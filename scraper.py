@@ -1,17 +1,68 @@
 import asyncio
-import json
+import orjson
 import re
+import sys
 import os
-import io
+import time
+import shutil
+import tempfile
+import threading
 import zipfile
+from email.utils import formatdate
+from pathlib import Path
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+import urllib3.exceptions
+from urllib3.util.retry import Retry
+import numpy as np
+from lxml import etree
 from playwright.async_api import async_playwright
 import datetime
+from array import array
+from collections import namedtuple
 
 CLUB_URL = "https://ratingviewer.nl/lists/latest/clubs/020027"
 OUTPUT_FILE = "sissa_ratings.json"
 FIDE_XML_URL = "https://ratings.fide.com/download/standard_rating_list_xml.zip"
+CACHE_DIR = Path("cache")
+CACHE_TTL = 24 * 60 * 60  # Seconds before the current FIDE list is re-checked
+STATE_FILE = CACHE_DIR / "storage_state.json"
+PROFILE_CACHE_FILE = CACHE_DIR / "profile_cache.json"
+# Player fields read from the KNSB profile page (and cached between runs)
+PROFILE_FIELDS = ("games_played", "rating_change", "fide_id")
+PAGE_POOL_SIZE = 8  # Number of profile pages fetched concurrently
+PROFILE_TIMEOUT = 10  # Seconds before a single profile is given up on
+
+# Leaner headless Chromium: no /dev/shm (small in containers/CI), GPU or images
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# HTTP session per thread, since the FIDE lists are downloaded from two threads
+# and requests.Session is not thread-safe. Its adapter retries 502/503/504 from
+# the occasionally flaky FIDE server; requests also get a 30 s timeout.
+_THREAD_LOCAL = threading.local()
+
+def get_session():
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])))
+        _THREAD_LOCAL.session = session
+    return session
+
+# Trailing rating change in the KNSB calculation cell, e.g. "2702=2692 + 10"
+_CHANGE_RE = re.compile(r'([+-])\s?(\d+)$')
+
+# FIDE list stored column-wise: idx maps fide_id -> row in the parallel columns
+FideTable = namedtuple("FideTable", "idx ratings games titles countries birthdays")
+
+# Resources the scraper never reads; aborted to save bandwidth and render time
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+BLOCKED_DOMAINS = ("googletagmanager", "google-analytics", "doubleclick", "adsbygoogle")
 
 def get_previous_period_url():
     """Calculates the URL for the previous month's FIDE rating list."""
@@ -27,64 +78,211 @@ def get_previous_period_url():
     url = f"https://ratings.fide.com/download/standard_{mon}{yy}frl_xml.zip"
     return url
 
+def fetch_fide_zip(url):
+    """
+    Returns the local path of the FIDE ZIP at `url`, downloading it into
+    CACHE_DIR only when needed. Monthly archives never change once published;
+    the rolling current list is re-validated after CACHE_TTL seconds.
+    If a re-validation fails, the stale cached copy is returned instead.
+    Returns None if the download failed and nothing is cached.
+    """
+    cache_path = CACHE_DIR / url.rsplit("/", 1)[-1]
+    headers = {}
+    if cache_path.exists():
+        age = time.time() - cache_path.stat().st_mtime
+        if url != FIDE_XML_URL or age < CACHE_TTL:
+            print(f"Using cached FIDE List {cache_path}")
+            return cache_path
+        headers["If-Modified-Since"] = formatdate(cache_path.stat().st_mtime, usegmt=True)
+
+    print(f"Downloading FIDE List from {url}...")
+    try:
+        response = get_session().get(url, stream=True, headers=headers, timeout=30)
+    except requests.RequestException as e:
+        if cache_path.exists():
+            print(f"  -> Failed ({e}), using stale cache")
+            return cache_path
+        raise
+    if response.status_code == 304:
+        response.close()
+        print("  -> Not modified, using cache")
+        cache_path.touch()
+        return cache_path
+    if response.status_code != 200:
+        response.close()
+        if cache_path.exists():
+            print(f"  -> Failed (Status {response.status_code}), using stale cache")
+            return cache_path
+        print(f"  -> Failed (Status {response.status_code})")
+        return None
+
+    # Stream into a temporary file next to the cache entry and only move it into
+    # place once complete and a valid ZIP, so an interrupted download or an
+    # error page served with status 200 never ends up in the cache.
+    CACHE_DIR.mkdir(exist_ok=True)
+    response.raw.decode_content = True
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".part", delete=False) as f:
+        try:
+            shutil.copyfileobj(response.raw, f)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+            f.close()
+            os.unlink(f.name)
+            if cache_path.exists():
+                print(f"  -> Download interrupted ({e}), using stale cache")
+                return cache_path
+            raise
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    if not zipfile.is_zipfile(f.name):
+        os.unlink(f.name)
+        if cache_path.exists():
+            print("  -> Download is not a ZIP file, using stale cache")
+            return cache_path
+        print("  -> Download is not a ZIP file")
+        return None
+    os.replace(f.name, cache_path)
+    return cache_path
+
+def empty_fide_table():
+    return FideTable({}, array("i"), array("i"), [], [], [])
+
 def download_and_parse_fide_xml(url):
     """
     Downloads and parses a FIDE XML list from a given URL.
-    Returns: {fide_id: {rating, games}}
+    Returns: FideTable, where idx maps fide_id to a row in the column arrays.
     """
-    print(f"Downloading FIDE List from {url}...")
     try:
-        response = requests.get(url, stream=True)
-        if response.status_code != 200:
-            print(f"  -> Failed (Status {response.status_code})")
-            return {}
+        cache_path = fetch_fide_zip(url)
+        if cache_path is None:
+            return empty_fide_table()
             
-        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
+        with zipfile.ZipFile(cache_path) as z:
             xml_filename = [name for name in z.namelist() if name.endswith('.xml')][0]
             print(f"  -> Parsing {xml_filename}...")
             
-            fide_data = {}
+            fide_data = empty_fide_table()
             with z.open(xml_filename) as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-                
-                for player in root.findall('player'):
-                    fide_id = player.find('fideid').text
-                    rating = player.find('rating').text
-                    games = player.find('games').text
-                    title = player.find('title').text
-                    country = player.find('country').text
-                    birthday = player.find('birthday').text
+                # Stream the file and free each <player> once read, so memory
+                # stays flat instead of holding the whole DOM.
+                for _, player in etree.iterparse(f, events=("end",), tag="player"):
+                    fide_id = player.findtext('fideid')
+                    rating = player.findtext('rating')
+                    games = player.findtext('games')
+                    title = player.findtext('title')
+                    country = player.findtext('country')
+                    birthday = player.findtext('birthday')
                     
                     if fide_id:
-                        fide_data[fide_id] = {
-                            "rating": int(rating) if rating and rating.isdigit() else 0,
-                            "games": int(games) if games and games.isdigit() else 0,
-                            "title": title if title else "",
-                            "country": country if country else "",
-                            "birthday": birthday if birthday else ""
-                        }
+                        fide_data.idx[fide_id] = len(fide_data.ratings)
+                        fide_data.ratings.append(int(rating) if rating and rating.isdigit() else 0)
+                        fide_data.games.append(int(games) if games and games.isdigit() else 0)
+                        fide_data.titles.append(sys.intern(title) if title else "")
+                        fide_data.countries.append(sys.intern(country) if country else "")
+                        fide_data.birthdays.append(birthday if birthday else "")
+
+                    player.clear()
+                    while player.getprevious() is not None:
+                        del player.getparent()[0]
         
-        print(f"  -> Loaded {len(fide_data)} records.")
+        print(f"  -> Loaded {len(fide_data.idx)} records.")
         return fide_data
 
+    except zipfile.BadZipFile as e:
+        # Never keep a corrupt archive around; the next run downloads it again
+        print(f"Error processing FIDE XML {url}: {e}, removing {cache_path}")
+        cache_path.unlink(missing_ok=True)
+        return empty_fide_table()
     except Exception as e:
         print(f"Error processing FIDE XML {url}: {e}")
+        return empty_fide_table()
+
+def apply_fide_data(players, current_fide, prev_fide):
+    """Fills the FIDE rating, games and monthly change for players with a fide_id."""
+    for player in players:
+        if "fide_id" in player and player["fide_id"] not in current_fide.idx:
+            print(f"  -> FIDE ID {player['fide_id']} for {player['name']} not in XML list (inactive/unrated?)")
+
+    matched = [p for p in players if p.get("fide_id") in current_fide.idx]
+    if not matched:
+        return
+
+    # Align both lists on the matched players and diff all ratings at once.
+    # Players missing from the previous list point at a trailing 0 sentinel.
+    curr_ratings = np.frombuffer(current_fide.ratings, dtype=np.intc)
+    prev_ratings = np.append(np.frombuffer(prev_fide.ratings, dtype=np.intc), 0)
+    missing = len(prev_ratings) - 1
+    ci = np.fromiter((current_fide.idx[p["fide_id"]] for p in matched), dtype=np.intp, count=len(matched))
+    pi = np.fromiter((prev_fide.idx.get(p["fide_id"], missing) for p in matched), dtype=np.intp, count=len(matched))
+    curr = curr_ratings[ci]
+    prev = prev_ratings[pi]
+    deltas = curr - prev
+
+    for player, c, p, delta, in_prev in zip(matched, ci.tolist(), prev.tolist(), deltas.tolist(), (pi != missing).tolist()):
+        player["fide_rating"] = str(current_fide.ratings[c])
+        player["fide_games"] = str(current_fide.games[c])
+        
+        # Format change: "+15", "-5", "0"
+        if not in_prev:
+            player["fide_change"] = "0" # No history found
+        elif p > 0:
+            player["fide_change"] = f"+{delta}" if delta > 0 else str(delta)
+            
+        # Additional Details: List data is primary.
+        # If list data was empty/missing, maybe FIDE has it?
+        if not player["title"] and current_fide.titles[c]:
+            player["title"] = current_fide.titles[c]
+        if not player["country"] and current_fide.countries[c]:
+            player["country"] = current_fide.countries[c]
+        if not player["birthday"] and current_fide.birthdays[c]:
+            player["birthday"] = current_fide.birthdays[c]
+        
+        print(f"  -> FIDE {player['fide_id']} ({player['name']}): Rating {player['fide_rating']}, Change {player.get('fide_change', '0')}, Games {player['fide_games']}")
+        print(f"  -> Details: {player.get('title','')} | {player.get('country','')} | {player.get('birthday','')}")
+
+def load_profile_cache():
+    """
+    Returns the profile details saved by the previous run, keyed by profile URL.
+    The URL contains the KNSB list id, so entries only match within one list.
+    """
+    try:
+        with open(PROFILE_CACHE_FILE, "rb") as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
         return {}
+    return cache if isinstance(cache, dict) else {}
+
+def save_profile_cache(cache):
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(PROFILE_CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps(cache))
+
+async def block_unneeded_resources(route, request):
+    """Route handler that aborts images, fonts, CSS, media and trackers."""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(d in request.url for d in BLOCKED_DOMAINS):
+        await route.abort()
+    else:
+        await route.continue_()
 
 async def scrape_ratings():
     # 1. Prepare FIDE Data (Current & Previous)
     print("--- FIDE Data Preparation ---")
-    current_fide = download_and_parse_fide_xml(FIDE_XML_URL)
-    
+    # Both lists are independent, so download and parse them in parallel threads
     prev_url = get_previous_period_url()
-    prev_fide = download_and_parse_fide_xml(prev_url)
+    current_fide, prev_fide = await asyncio.gather(
+        asyncio.to_thread(download_and_parse_fide_xml, FIDE_XML_URL),
+        asyncio.to_thread(download_and_parse_fide_xml, prev_url)
+    )
     
     print("-----------------------------")
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        context = await browser.new_context(
+            storage_state=STATE_FILE if STATE_FILE.exists() else None
+        )
+        await context.route("**/*", block_unneeded_resources)
         page = await context.new_page()
 
         print(f"Navigating to {CLUB_URL}...")
@@ -113,152 +311,178 @@ async def scrape_ratings():
         except Exception as e:
             print(f"Pagination handling failed: {e}")
 
-        # Grab all rows
-        rows = await page.query_selector_all(".rdt_TableRow")
+        # Grab all rows in a single round-trip to the browser
+        rows = await page.evaluate("""
+            () => Array.from(document.querySelectorAll('.rdt_TableRow')).map(row => {
+                const cell = id => row.querySelector(`div[data-column-id='${id}']`);
+                const text = id => cell(id)?.innerText.trim() ?? '';
+                const nameLink = row.querySelector("div[data-column-id='Name'] a");
+                return {
+                    name: nameLink ? nameLink.innerText : null,
+                    href: nameLink ? nameLink.getAttribute('href') : null,
+                    rating: cell('Rating') ? text('Rating') : null,
+                    // New Columns
+                    title: text('3'),
+                    fed: text('4'),
+                    yob: text('6'),
+                    sex: text('7')
+                };
+            })
+        """)
         print(f"Found {len(rows)} players in the list.")
 
         for row in rows:
-            name_el = await row.query_selector("div[data-column-id='Name'] a")
-            rating_el = await row.query_selector("div[data-column-id='Rating']")
-            
-            # New Columns
-            title_el = await row.query_selector("div[data-column-id='3']")
-            fed_el = await row.query_selector("div[data-column-id='4']")
-            yob_el = await row.query_selector("div[data-column-id='6']")
-            sex_el = await row.query_selector("div[data-column-id='7']")
-
-            if name_el and rating_el:
-                name = await name_el.inner_text()
-                profile_url = await name_el.get_attribute("href")
-                current_rating = (await rating_el.inner_text()).strip()
-                
-                # Extract texts
-                title_val = (await title_el.inner_text()).strip() if title_el else ""
-                fed_val = (await fed_el.inner_text()).strip() if fed_el else ""
-                yob_val = (await yob_el.inner_text()).strip() if yob_el else ""
-                sex_val = (await sex_el.inner_text()).strip() if sex_el else ""
-
+            if row["name"] is not None and row["rating"] is not None:
                 players.append({
-                    "name": name,
-                    "profile_url": f"https://ratingviewer.nl{profile_url}",
-                    "current_rating": current_rating,
+                    "name": row["name"],
+                    "profile_url": f"https://ratingviewer.nl{row['href']}",
+                    "current_rating": row["rating"],
                     "rating_change": "0",
                     "games_played": "0",
-                    "title": title_val,
-                    "country": fed_val,
-                    "birthday": yob_val,
-                    "gender": sex_val,
-                    # Internal field for processing
-                    "_full_profile_url": f"https://ratingviewer.nl{profile_url}"
+                    # Few distinct values, so share one string object each
+                    "title": sys.intern(row["title"]),
+                    "country": sys.intern(row["fed"]),
+                    "birthday": row["yob"],
+                    "gender": sys.intern(row["sex"])
                 })
 
         print(f"Basic data extracted for {len(players)} players. Fetching details...")
 
         # Fetch details for each player (KNSB Only)
-        for i, player in enumerate(players):
-            print(f"[{i+1}/{len(players)}] Processing {player['name']}...")
+        # Profile pages are rendered client-side (same React app as the club
+        # list), so a plain HTTP fetch only returns an empty shell; they have to
+        # go through the browser.
+        # Profiles are visited concurrently; the queue holds a fixed pool of
+        # pages, so at most PAGE_POOL_SIZE navigations are in flight at once.
+        page_pool = asyncio.Queue()
+        await page_pool.put(page)
+        for _ in range(PAGE_POOL_SIZE - 1):
+            await page_pool.put(await context.new_page())
+
+        # Profiles already read for this list with an unchanged rating are
+        # taken from the previous run's cache instead of being revisited.
+        profile_cache = load_profile_cache()
+        new_profile_cache = {}
+
+        async def read_profile(page, url, player):
+            """
+            Reads the KNSB stats and FIDE ID from a profile into `player`.
+            Returns whether the summary cells were found (and may be cached).
+            """
+            await page.goto(url, wait_until="domcontentloaded")
+
+            # Wait for ANY table to ensure page load
+            loaded = True
             try:
-                await page.goto(player['_full_profile_url'])
+                await page.wait_for_selector("table", timeout=5000)
+            except Exception as e:
+                loaded = False
+                print(f"  -> Error KNSB stats ({player['name']}): {e}")
 
-                # 1. Get KNSB History (Latest Month) - Optimized using Summary Table
-                try:
-                    # Wait for ANY table to ensure page load
-                    await page.wait_for_selector("table", timeout=5000)
-                    
-                    # Extract Games Played from Summary Table (Cell containing "#Gespeeld")
-                    # Format: "#Gespeeld\n5"
-                    games_cell = await page.query_selector("td:has-text('#Gespeeld')")
-                    if games_cell:
-                        text = await games_cell.inner_text()
-                        # Take the number after the newline
-                        if "\n" in text:
-                            player["games_played"] = text.split("\n")[-1].strip()
-                    
-                    # Extract Rating Change from Calculation Cell
-                    # Format: "Berekening\n\n2702=2692 + 10"
-                    calc_cell = await page.query_selector("td:has-text('Berekening')")
-                    if calc_cell:
-                        text = await calc_cell.inner_text()
-                        # Look for the last numbers " + 10" or " - 5" at the end of the string
-                        # Simple parse: split by space, look for + or -
-                        # Or regex search for [+-]\s?\d+$
-                        import re
-                        change_match = re.search(r'([+-])\s?(\d+)$', text.strip())
-                        if change_match:
-                            sign = change_match.group(1)
-                            val = change_match.group(2)
-                            # Re-construct: +10 or -5
-                            if sign == "+":
-                                player["rating_change"] = val # + is implied or we can add it later if needed, but JSON usually stores raw num key? 
-                                # Current JSON has "15" (positive) or "-20"
-                                # If sign is +, store as "10". If -, store as "-5"
-                                player["rating_change"] = val
-                            else:
-                                player["rating_change"] = f"-{val}"
-                        elif "=" in text:
-                             # Fallback logic if regex fails but we have "A=B +/- C"
-                             pass
-
-                except Exception as e:
-                    print(f"  -> Error KNSB stats: {e}")
-
-                # 2. Get FIDE ID (from Profile Link)
-                fide_link = await page.query_selector("a[href*='ratings.fide.com/profile/']")
-                if fide_link:
-                    fide_url = await fide_link.get_attribute("href")
-                    # Extract ID from URL
-                    match = re.search(r'profile/(\d+)', fide_url)
-                    if match:
-                        fide_id = match.group(1)
-                        player["fide_id"] = fide_id
-                        
-                        # 3. Match with FIDE Data
-                        if fide_id in current_fide:
-                            curr_rec = current_fide[fide_id]
-                            player["fide_rating"] = str(curr_rec["rating"])
-                            player["fide_games"] = str(curr_rec["games"])
-                            
-                            # Calculate Change
-                            prev_rating = 0
-                            if fide_id in prev_fide:
-                                prev_rating = prev_fide[fide_id]["rating"]
-                                if prev_rating > 0:
-                                     change = curr_rec["rating"] - prev_rating
-                                     # Format change: "+15", "-5", "0"
-                                     player["fide_change"] = f"+{change}" if change > 0 else str(change)
-                            else:
-                                player["fide_change"] = "0" # No history found
-                                
-                            # Additional Details: List data is primary.
-                            # If list data was empty/missing, maybe FIDE has it?
-                            if not player["title"] and curr_rec["title"]:
-                                player["title"] = curr_rec["title"]
-                            if not player["country"] and curr_rec["country"]:
-                                player["country"] = curr_rec["country"]
-                            if not player["birthday"] and curr_rec["birthday"]:
-                                player["birthday"] = curr_rec["birthday"]
-                            
-                            print(f"  -> FIDE {fide_id}: Rating {curr_rec['rating']}, Change {player['fide_change']}, Games {curr_rec['games']}")
-                            print(f"  -> Details: {player.get('title','')} | {player.get('country','')} | {player.get('birthday','')}")
-                        else:
-                            print(f"  -> FIDE ID {fide_id} found but not in XML list (inactive/unrated?)")
+            # Read the summary cells and the FIDE link in a single round-trip
+            data = await page.evaluate("""
+                () => {
+                    const tds = [...document.querySelectorAll('td')];
+                    const find = t => tds.find(td => td.innerText.includes(t))?.innerText || '';
+                    const a = document.querySelector("a[href*='ratings.fide.com/profile/']");
+                    return {
+                        games: find('#Gespeeld'),
+                        calc: find('Berekening'),
+                        fide: a?.getAttribute('href') || ''
+                    };
+                }
+            """)
+
+            # 1. Get KNSB History (Latest Month) - Optimized using Summary Table
+            # Games Played from Summary Table (Cell containing "#Gespeeld")
+            # Format: "#Gespeeld\n5"
+            text = data["games"]
+            # Take the number after the newline
+            if "\n" in text:
+                player["games_played"] = text.split("\n")[-1].strip()
+            
+            # Rating Change from Calculation Cell
+            # Format: "Berekening\n\n2702=2692 + 10"
+            text = data["calc"]
+            if text:
+                # Look for the last numbers " + 10" or " - 5" at the end of the string
+                # Simple parse: split by space, look for + or -
+                # Or regex search for [+-]\s?\d+$
+                change_match = _CHANGE_RE.search(text.strip())
+                if change_match:
+                    sign, val = change_match.groups()
+                    # Current JSON has "15" (positive) or "-20"
+                    player["rating_change"] = val if sign == "+" else f"-{val}"
+
+            # 2. Get FIDE ID (from Profile Link)
+            fide_url = data["fide"]
+            if fide_url:
+                # Extract ID from URL
+                match = re.search(r'profile/(\d+)', fide_url)
+                if match:
+                    player["fide_id"] = match.group(1)
+
+            # Only a read that found the summary cells is worth caching; the
+            # React summary may not have rendered yet when the table appeared.
+            return loaded and bool(data["games"] or data["calc"])
+
+        async def process(i, player):
+            url = player['profile_url']
+            cached = profile_cache.get(url)
+            if isinstance(cached, dict) and cached.get("current_rating") == player["current_rating"]:
+                print(f"[{i+1}/{len(players)}] {player['name']}: using cached profile")
+                for key in PROFILE_FIELDS:
+                    if key in cached:
+                        player[key] = cached[key]
+                new_profile_cache[url] = cached
+                return
+
+            page = await page_pool.get()
+            print(f"[{i+1}/{len(players)}] Processing {player['name']}...")
+            try:
+                loaded = await asyncio.wait_for(read_profile(page, url, player), PROFILE_TIMEOUT)
+                if loaded:
+                    new_profile_cache[url] = {
+                        "current_rating": player["current_rating"],
+                        **{key: player[key] for key in PROFILE_FIELDS if key in player}
+                    }
 
+            except asyncio.TimeoutError:
+                print(f"Error processing {player['name']}: timed out after {PROFILE_TIMEOUT}s")
             except Exception as e:
                 print(f"Error processing {player['name']}: {e}")
+            finally:
+                page_pool.put_nowait(page)
 
-        # Cleanup internal fields
-        for p in players:
-            if "_full_profile_url" in p: del p["_full_profile_url"]
+        results = await asyncio.gather(
+            *(process(i, player) for i, player in enumerate(players)),
+            return_exceptions=True
+        )
+        for player, result in zip(players, results):
+            if isinstance(result, Exception):
+                print(f"Error processing {player['name']}: {result!r}")
+        save_profile_cache(new_profile_cache)
+
+        # Match with FIDE Data
+        print("Matching players with FIDE data...")
+        try:
+            apply_fide_data(players, current_fide, prev_fide)
+        except Exception as e:
+            print(f"Error matching FIDE data: {e}")
 
         # Save to JSON
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump({
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps({
                 "club": "JSV SISSA",
                 "timestamp": datetime.datetime.now().isoformat(),
                 "players": players
-            }, f, indent=4)
+            }, option=orjson.OPT_INDENT_2))
         
         print(f"Done! Saved data to {OUTPUT_FILE}")
+
+        # Keep cookies/local storage for the next run
+        CACHE_DIR.mkdir(exist_ok=True)
+        await context.storage_state(path=STATE_FILE)
         await browser.close()
 
 if __name__ == "__main__":